@@ -1,18 +1,49 @@
 import argparse
+import atexit
 import logging
+import os
+import queue
 import traceback
-from typing import Any, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import yaml
 from pandas import DataFrame
+from pyarrow import csv as pa_csv
 import time
 
 
+_log_listener: Optional[QueueListener] = None
+
+
+def stop_log_listener() -> None:
+    """
+    Stop the background log listener, flushing any queued records.
+
+    Returns:
+        None
+    """
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
 def setup_logging(log_file_path: str, log_level: str) -> None:
     """
     Set up logging configuration.
 
+    Log records are put on a queue and formatted/written by a background
+    QueueListener thread, so pipeline code never blocks on disk I/O for
+    a log line.
+
     Args:
         log_file_path (str): Path to the log file.
         log_level (str): Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL).
@@ -20,6 +51,9 @@ def setup_logging(log_file_path: str, log_level: str) -> None:
     Returns:
         None
     """
+    # Flush any listener left over from a previous configuration
+    stop_log_listener()
+
     # Create logger
     logger: logging.Logger = logging.getLogger()
     logger.setLevel(log_level)
@@ -39,9 +73,14 @@ def setup_logging(log_file_path: str, log_level: str) -> None:
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
 
-    # Add the handlers to the logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # Logging calls only enqueue; the listener thread owns the handlers
+    log_queue: queue.Queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+
+    global _log_listener
+    _log_listener = QueueListener(log_queue, file_handler, console_handler)
+    _log_listener.start()
+    atexit.register(stop_log_listener)
 
 
 def load_config(config_file: str) -> Dict[str, Any]:
@@ -80,14 +119,170 @@ def update_values(
     Returns:
         dict: Updated dictionary.
     """
-    for key, value in update_dict.items():
-        if value is not None:
-            original_dict[key] = value
+    original_dict.update(
+        {k: v for k, v in update_dict.items() if v is not None}
+    )
     return original_dict
 
 
+def run_polars_pipeline(config: Dict[str, Any]) -> None:
+    """
+    Execute the whole pipeline as a single Polars lazy query.
+
+    The filter, join, temporal extraction and groupby are fused by the
+    query optimizer and executed in one parallel streaming pass, so no
+    intermediate DataFrame is ever materialized.
+
+    Args:
+        config (dict): Configuration dictionary.
+
+    Returns:
+        None
+    """
+    logger: logging.Logger = logging.getLogger(__name__)
+    logger.info("Building Polars lazy query...")
+    orders: pl.LazyFrame = (
+        pl.scan_csv(
+            config["orders_dataset_path"],
+            try_parse_dates=True,
+            schema_overrides={"order_status": pl.Categorical},
+        )
+        .filter(pl.col("order_status") == config["order_status_filter"])
+        .select(["order_id", "order_purchase_timestamp"])
+    )
+    order_items: pl.LazyFrame = pl.scan_csv(
+        config["order_items_dataset_path"],
+        schema_overrides={"product_id": pl.Categorical},
+    ).select(["order_id", "product_id"])
+
+    products_sales_weekly: pl.LazyFrame = (
+        order_items.join(orders, on="order_id", how="inner")
+        .with_columns(
+            [
+                pl.col("order_purchase_timestamp")
+                .dt.year()
+                .cast(pl.UInt16)
+                .alias("year"),
+                pl.col("order_purchase_timestamp")
+                .dt.week()
+                .cast(pl.UInt8)
+                .alias("week"),
+            ]
+        )
+        .group_by(["product_id", "year", "week"])
+        .agg(pl.len().cast(pl.UInt32).alias("sales"))
+        # Partition values are plain strings on disk, so un-dictionary the
+        # key before the partitioned write.
+        .with_columns(pl.col("product_id").cast(pl.String))
+        .sort(["product_id", "year", "week"])
+    )
+
+    logger.info("Saving results to %s...", config["output_path"])
+    # Sinking keeps the plan on the streaming engine end to end: result
+    # partitions go to disk as they are produced instead of being
+    # collected into one frame first.
+    products_sales_weekly.sink_parquet(
+        pl.PartitionBy(
+            config["output_path"],
+            key=config["partition_cols"],
+            include_key=False,
+        )
+    )
+
+
+_numba_count_kernel = None
+
+
+def _get_numba_count_kernel():
+    """
+    Build (once) and return the jitted dense-key counting kernel.
+    Numba is imported lazily so the dependency is only required when
+    the kernel is actually enabled.
+    """
+    global _numba_count_kernel
+    if _numba_count_kernel is None:
+        from numba import njit
+
+        @njit(cache=True)
+        def count_keys(keys, size):
+            counts = np.zeros(size, dtype=np.int64)
+            for i in range(keys.size):
+                counts[keys[i]] += 1
+            return counts
+
+        _numba_count_kernel = count_keys
+    return _numba_count_kernel
+
+
+def _count_orders_numba(df_products_sales: DataFrame) -> DataFrame:
+    """
+    Count orders per (product, year, week) with a jitted count kernel.
+
+    The product_id strings are factorized to int64 codes and year/week
+    are packed into one int64; both are fused into a single dense key
+    so the hot loop is one array-indexed counting pass with no hashing
+    and no Python objects.
+
+    Args:
+        df_products_sales (pandas.DataFrame):
+            DataFrame containing product sales data.
+
+    Returns:
+        pandas.DataFrame:
+            DataFrame with the number of orders per product per week.
+    """
+    product_values = df_products_sales["product_id"]
+    if isinstance(product_values.dtype, pd.CategoricalDtype):
+        # Already dictionary-encoded at ingest: reuse the codes instead
+        # of rehashing the values.
+        codes = product_values.cat.codes.to_numpy()
+        products = product_values.cat.categories
+    else:
+        codes, products = pd.factorize(product_values, sort=True)
+    # ISO week via int64 day arithmetic: the Thursday of each week
+    # determines its week number (1970-01-01 was a Thursday).
+    days = (
+        df_products_sales["order_purchase_timestamp"]
+        .to_numpy()
+        .astype("datetime64[D]")
+    )
+    weekday = (days.view("int64") + 3) % 7
+    thursday = days - weekday.astype("timedelta64[D]") + np.timedelta64(
+        3, "D"
+    )
+    iso_jan1 = thursday.astype("datetime64[Y]").astype("datetime64[D]")
+    week = (thursday - iso_jan1).view("int64") // 7 + 1
+    year = days.astype("datetime64[Y]").view("int64") + 1970
+    year_week = (year << 6) | week
+
+    # Factorize the packed year-week so the fused key is dense and the
+    # kernel can count into a plain array instead of a hash map.
+    yw_codes, yw_unique = pd.factorize(year_week, sort=True)
+    n_yw = len(yw_unique)
+    keys = codes.astype(np.int64) * n_yw + yw_codes
+
+    try:
+        counts = _get_numba_count_kernel()(keys, len(products) * n_yw)
+        occupied = np.nonzero(counts)[0]
+        sales = counts[occupied]
+    except ImportError:
+        # Same packed key, compiled NumPy instead of a jitted kernel:
+        # one sort + scan pass over dense integers.
+        occupied, sales = np.unique(keys, return_counts=True)
+    packed_yw = yw_unique[occupied % n_yw]
+    return pd.DataFrame(
+        {
+            "product_id": np.asarray(products)[occupied // n_yw],
+            "year": (packed_yw >> 6).astype("uint16"),
+            "week": (packed_yw & 63).astype("uint8"),
+            "sales": sales.astype("uint32"),
+        }
+    ).sort_values(["product_id", "year", "week"], ignore_index=True)
+
+
 def calculate_orders_per_product_per_week(
     df_products_sales: DataFrame,
+    use_numba: bool = False,
 ) -> DataFrame:
     """
     Calculate the number of orders per product per week.
@@ -95,6 +290,9 @@ def calculate_orders_per_product_per_week(
     Args:
         df_products_sales (pandas.DataFrame):
             DataFrame containing product sales data.
+        use_numba (bool):
+            Count with the jitted integer kernel instead of the
+            Polars groupby.
 
     Returns:
         pandas.DataFrame:
@@ -102,27 +300,115 @@ def calculate_orders_per_product_per_week(
     """
     logger: logging.Logger = logging.getLogger(__name__)
     logger.info("Calculating number of orders per product per week...")
-    df_copy: DataFrame = df_products_sales.copy(deep=False)
-    df_copy["week"] = (
-        df_copy["order_purchase_timestamp"]
-        .dt.isocalendar()
-        .week.astype("uint8")
-    )
-    df_copy["year"] = df_copy["order_purchase_timestamp"].dt.year.astype(
-        "uint16"
-    )
+    if use_numba:
+        return _count_orders_numba(df_products_sales)
+    # A single Polars expression fuses the year/week extraction with the
+    # hash groupby in one multi-threaded pass, so the two key columns
+    # are never materialized on the input frame.
     return (
-        df_copy.groupby(["product_id", "year", "week"])
-        .size()
-        .reset_index(name="sales")
-        .astype({"sales": "uint32"})
+        pl.from_pandas(
+            df_products_sales[
+                ["product_id", "order_purchase_timestamp"]
+            ],
+            rechunk=True,
+        )
+        .group_by(
+            [
+                pl.col("product_id"),
+                pl.col("order_purchase_timestamp")
+                .dt.year()
+                .cast(pl.UInt16)
+                .alias("year"),
+                pl.col("order_purchase_timestamp")
+                .dt.week()
+                .cast(pl.UInt8)
+                .alias("week"),
+            ]
+        )
+        .agg(pl.len().cast(pl.UInt32).alias("sales"))
+        .sort(["product_id", "year", "week"])
+        .to_pandas()
     )
 
 
+def _input_dataset(path: str) -> ds.Dataset:
+    """
+    Return a dataset for the given input CSV, backed by a Parquet cache.
+
+    CSV parsing dominates read time but the inputs rarely change, so the
+    parsed table is written to ``<path>.parquet`` on first read and
+    reused while it is newer than the CSV.
+
+    Args:
+        path (str): Path to the input CSV file.
+
+    Returns:
+        pyarrow.dataset.Dataset: Dataset over the cached Parquet file.
+    """
+    cache_path: str = path + ".parquet"
+    if not (
+        os.path.exists(cache_path)
+        and os.path.getmtime(cache_path) >= os.path.getmtime(path)
+    ):
+        # 64 MiB blocks keep the threaded parser fed on fast storage
+        # instead of the default 64 KiB per read. product_id is
+        # dictionary-encoded at parse time so joins and groupbys key on
+        # int32 codes instead of 32-char strings.
+        csv_format = ds.CsvFileFormat(
+            read_options=pa_csv.ReadOptions(block_size=64 << 20),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={
+                    "product_id": pa.dictionary(pa.int32(), pa.string()),
+                    "order_status": pa.dictionary(
+                        pa.int32(), pa.string()
+                    ),
+                },
+                # All timestamps in the Olist CSVs share one format;
+                # naming it skips per-value format inference.
+                timestamp_parsers=["%Y-%m-%d %H:%M:%S"],
+            ),
+        )
+        # Stream batches straight into the Parquet writer so peak
+        # memory stays at roughly one read block instead of the whole
+        # parsed file.
+        scanner = ds.dataset(path, format=csv_format).scanner()
+        with pq.ParquetWriter(
+            cache_path, scanner.projected_schema, compression="zstd"
+        ) as writer:
+            for batch in scanner.to_batches():
+                writer.write_batch(batch)
+    return ds.dataset(cache_path, format="parquet")
+
+
+def _hash_order_id(df: DataFrame) -> DataFrame:
+    """
+    Replace the 32-character order_id string with a uint64 hash column.
+
+    The column is only ever used as a join key, so hashing it once at
+    ingest turns every later hash/compare into cheap integer work
+    instead of re-scanning 32 bytes per row. Collisions at 64 bits are
+    negligible for datasets of this size.
+
+    Args:
+        df (DataFrame): DataFrame with an order_id column.
+
+    Returns:
+        DataFrame: Same frame with order_id hashed to uint64.
+    """
+    df["order_id"] = pd.util.hash_array(
+        df["order_id"].to_numpy(), categorize=False
+    )
+    return df
+
+
 def read_input_data(config: Dict[str, Any]) -> Tuple[DataFrame, DataFrame]:
     """
     Read input data from the given configuration.
 
+    The orders CSV is streamed with PyArrow and filtered by
+    ``order_status_filter`` while reading, so only matching rows are
+    ever converted to pandas.
+
     Args:
         config (dict): Configuration dictionary.
 
@@ -131,20 +417,41 @@ def read_input_data(config: Dict[str, Any]) -> Tuple[DataFrame, DataFrame]:
     """
     logger: logging.Logger = logging.getLogger(__name__)
     # Read input data
-    logger.info("Reading input data...")
-    df_orders: DataFrame = pd.read_csv(
-        config["orders_dataset_path"],
-        index_col="order_id",
-        parse_dates=["order_purchase_timestamp"],
-        usecols=["order_id", "order_status", "order_purchase_timestamp"],
-        dtype={"order_status": "category", "order_id": "str"},
-    )
-    df_order_items: DataFrame = pd.read_csv(
-        config["order_items_dataset_path"],
-        usecols=["order_id", "product_id"],
-        dtype={"order_id": "str", "product_id": "str"},
-        index_col="order_id",
+    logger.info(
+        "Reading input data (order_status == %s)...",
+        config["order_status_filter"],
     )
+    # The dataset scanner pushes the status predicate and the column
+    # projection into the batched reader, so only matching rows of the
+    # two needed columns are ever materialized.
+    # Only the small delivered-orders side gets an index (it backs the
+    # timestamp lookup); the large items table keeps order_id as a
+    # plain column and never pays for an Index build.
+    def load_orders() -> DataFrame:
+        return _hash_order_id(
+            _input_dataset(config["orders_dataset_path"])
+            .to_table(
+                filter=ds.field("order_status")
+                == config["order_status_filter"],
+                columns=["order_id", "order_purchase_timestamp"],
+            )
+            .to_pandas()
+        ).set_index("order_id")
+
+    def load_order_items() -> DataFrame:
+        return _hash_order_id(
+            _input_dataset(config["order_items_dataset_path"])
+            .to_table(columns=["order_id", "product_id"])
+            .to_pandas()
+        )
+
+    # The readers release the GIL during I/O and parsing, so the two
+    # files load concurrently.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        orders_future = executor.submit(load_orders)
+        items_future = executor.submit(load_order_items)
+        df_orders: DataFrame = orders_future.result()
+        df_order_items: DataFrame = items_future.result()
 
     logger.info(
         "Memory usage of df_orders: %.2f MB",
@@ -157,40 +464,6 @@ def read_input_data(config: Dict[str, Any]) -> Tuple[DataFrame, DataFrame]:
     return df_orders, df_order_items
 
 
-def filter_orders_by_status(
-    df_orders: DataFrame, order_status_filter: str
-) -> DataFrame:
-    """
-    Filter the orders DataFrame based on the given order status.
-
-    Args:
-        df_orders (DataFrame): Orders DataFrame.
-        order_status_filter (str): Order status to filter.
-
-    Returns:
-        DataFrame: Filtered orders DataFrame.
-    """
-    logger: logging.Logger = logging.getLogger(__name__)
-    # Filter df_orders by order_status
-    logger.info("Filtering orders by status: %s", order_status_filter)
-    return df_orders[df_orders["order_status"] == order_status_filter]
-
-
-def select_relevant_columns(df_orders_delivered: DataFrame) -> DataFrame:
-    """
-    Select relevant columns from the orders DataFrame.
-
-    Args:
-        df_orders_delivered (DataFrame): Orders DataFrame.
-
-    Returns:
-        DataFrame: DataFrame with relevant columns.
-    """
-    logger: logging.Logger = logging.getLogger(__name__)
-    logger.info("Selecting relevant columns...")
-    return df_orders_delivered[["order_purchase_timestamp"]]
-
-
 def join_dataframes(
     df_order_items: DataFrame, df_orders_delivered: DataFrame
 ) -> DataFrame:
@@ -206,9 +479,14 @@ def join_dataframes(
     """
     logger: logging.Logger = logging.getLogger(__name__)
     logger.info("Joining dataframes...")
-    return df_order_items.merge(
-        df_orders_delivered, left_index=True, right_index=True, how="inner"
-    )
+    # The delivered orders reduce to one timestamp per order_id: a
+    # single broadcast map probe tags each item row, and rows without a
+    # delivered order fall out with the missing timestamps. One hash
+    # probe per row, no intermediate join table, no separate isin pass.
+    timestamps: pd.Series = df_orders_delivered["order_purchase_timestamp"]
+    return df_order_items.assign(
+        order_purchase_timestamp=df_order_items["order_id"].map(timestamps)
+    ).dropna(subset=["order_purchase_timestamp"])
 
 
 def save_results(
@@ -227,11 +505,32 @@ def save_results(
     """
     logger: logging.Logger = logging.getLogger(__name__)
     logger.info("Saving results to %s...", config["output_path"])
-    df_products_sales_weekly.to_parquet(
-        config["output_path"],
-        partition_cols=config["partition_cols"],
-        engine=config["output_engine"],
-        index=False,
+    table: pa.Table = pa.Table.from_pandas(
+        df_products_sales_weekly, preserve_index=False
+    )
+    # write_dataset parallelizes column encoding and compression across
+    # threads internally, replacing the manual per-partition thread pool.
+    ds.write_dataset(
+        table,
+        base_dir=config["output_path"],
+        format="parquet",
+        partitioning=ds.partitioning(
+            table.select(config["partition_cols"]).schema, flavor="hive"
+        ),
+        file_options=ds.ParquetFileFormat().make_write_options(
+            # ZSTD-3 compresses noticeably better than snappy at
+            # similar CPU cost, cutting the bytes written out.
+            compression="zstd",
+            compression_level=3,
+            # Downstream readers only ever filter on the partition
+            # column, so per-column min/max/null stats are dead weight.
+            write_statistics=False,
+        ),
+        existing_data_behavior="overwrite_or_ignore",
+        # One partition per product, far beyond the default cap of 1024
+        max_partitions=1 << 20,
+        max_rows_per_group=256_000,
+        use_threads=True,
     )
 
 
@@ -256,22 +555,22 @@ def main(args: argparse.Namespace) -> None:
 
         start_time = time.time()
 
-        df_orders: DataFrame
-        df_order_items: DataFrame
-        df_orders, df_order_items = read_input_data(config)
-        df_orders_delivered: DataFrame = filter_orders_by_status(
-            df_orders, config["order_status_filter"]
-        )
-        df_orders_delivered: DataFrame = select_relevant_columns(
-            df_orders_delivered
-        )
-        df_products_sales: DataFrame = join_dataframes(
-            df_order_items, df_orders_delivered
-        )
-        df_products_sales_weekly: DataFrame = (
-            calculate_orders_per_product_per_week(df_products_sales)
-        )
-        save_results(df_products_sales_weekly, config)
+        if config.get("engine", "pandas") == "polars":
+            run_polars_pipeline(config)
+        else:
+            df_orders: DataFrame
+            df_order_items: DataFrame
+            df_orders, df_order_items = read_input_data(config)
+            df_products_sales: DataFrame = join_dataframes(
+                df_order_items, df_orders
+            )
+            df_products_sales_weekly: DataFrame = (
+                calculate_orders_per_product_per_week(
+                    df_products_sales,
+                    use_numba=config.get("use_numba_groupby", False),
+                )
+            )
+            save_results(df_products_sales_weekly, config)
 
         end_time = time.time()
         execution_time = end_time - start_time
@@ -284,6 +583,9 @@ def main(args: argparse.Namespace) -> None:
         logger.error("An error occurred: %s", str(e))
         logger.error(traceback.format_exc())
         return
+    finally:
+        # Flush queued records so the log file is complete on return
+        stop_log_listener()
 
 
 if __name__ == "__main__":
@@ -313,9 +615,16 @@ if __name__ == "__main__":
         "--order_status_filter", type=str, help="Filter orders by status"
     )
     parser.add_argument(
-        "--output_engine",
+        "--engine",
         type=str,
-        help="Engine to use for writing the output Parquet file",
+        choices=["pandas", "polars"],
+        help="Execution engine for the pipeline (pandas or polars)",
+    )
+    parser.add_argument(
+        "--use_numba_groupby",
+        action="store_true",
+        default=None,
+        help="Count weekly sales with the Numba-jitted integer kernel",
     )
     parser.add_argument(
         "--partition_cols",
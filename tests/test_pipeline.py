@@ -40,6 +40,23 @@ def test_calculate_orders_per_product_per_week(sample_data):
     pd.testing.assert_frame_equal(result, expected_values, check_dtype=False)
 
 
+def test_calculate_orders_per_product_per_week_numba(sample_data):
+    # The jitted kernel must match the default implementation
+    result = calculate_orders_per_product_per_week(
+        sample_data, use_numba=True
+    )
+
+    expected_values = pd.DataFrame(
+        {
+            "product_id": [101, 102],
+            "year": [2023, 2023],
+            "week": [1, 1],
+            "sales": [2, 1],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected_values, check_dtype=False)
+
+
 def test_update_values():
     # Test case 1: Update all values
     original_dict = {"a": 1, "b": 2, "c": 3}
@@ -74,7 +91,6 @@ def test_main(tmp_path, caplog):
             "test-resources/in/olist_order_items_dataset.csv",
             "output_path": output_path,
             "order_status_filter": "delivered",
-            "output_engine": "fastparquet",
             "partition_cols": ["product_id"],
             "log_level": "INFO",
             "log_file_path": log_file_path,
@@ -93,9 +109,7 @@ def test_main(tmp_path, caplog):
     # Define the expected log messages
     expected_logs = [
         "Starting pipeline execution.",
-        "Reading input data...",
-        "Filtering orders by status: delivered",
-        "Selecting relevant columns...",
+        "Reading input data (order_status == delivered)...",
         "Joining dataframes...",
         "Calculating number of orders per product per week...",
         f"Saving results to {output_path}...",
@@ -113,6 +127,62 @@ def test_main(tmp_path, caplog):
             assert log in log_contents
 
 
+def test_main_polars(tmp_path, caplog):
+
+    output_path = f"{tmp_path}/products_sales"
+    log_file_path = f"{tmp_path}/pipeline.log"
+    # Mock the call to pipeline.load_config
+    with patch("pipeline.load_config") as mock_load_config:
+        # Define the dictionary to be returned by pipeline.load_config
+        config_dict = {
+            "orders_dataset_path":
+            "test-resources/in/olist_orders_dataset.csv",
+            "order_items_dataset_path":
+            "test-resources/in/olist_order_items_dataset.csv",
+            "output_path": output_path,
+            "order_status_filter": "delivered",
+            "engine": "polars",
+            "partition_cols": ["product_id"],
+            "log_level": "INFO",
+            "log_file_path": log_file_path,
+        }
+        mock_load_config.return_value = config_dict
+
+        # Run the main function with the sample configuration file
+        args = argparse.Namespace(config="")
+        main(args)
+
+    # Check if the output file matches the pandas engine's output
+    expected_values = pd.read_parquet("test-resources/out/products_sales")
+    result = pd.read_parquet(output_path)
+    columns = ["product_id", "year", "week", "sales"]
+    sort_result = (
+        result[columns]
+        .astype({"product_id": "str"})
+        .sort_values(columns)
+        .reset_index(drop=True)
+    )
+    sort_expected = (
+        expected_values[columns]
+        .astype({"product_id": "str"})
+        .sort_values(columns)
+        .reset_index(drop=True)
+    )
+    pd.testing.assert_frame_equal(
+        sort_result, sort_expected, check_dtype=False
+    )
+
+    # Check if the expected log messages are present
+    expected_logs = [
+        "Starting pipeline execution.",
+        "Building Polars lazy query...",
+        f"Saving results to {output_path}...",
+        "Pipeline execution completed successfully.",
+    ]
+    for log in expected_logs:
+        assert log in caplog.text
+
+
 def test_load_config(tmp_path):
     # Create a temporary config file
     config_file = tmp_path / "config.yaml"
@@ -122,7 +192,6 @@ def test_load_config(tmp_path):
     order_items_dataset_path: "test-resources/in/olist_order_items_dataset.csv"
     output_path: "test-resources/out/products_sales"
     order_status_filter: "delivered"
-    output_engine: "fastparquet"
     partition_cols:
       - "product_id"
     log_level: "INFO"
@@ -140,7 +209,6 @@ def test_load_config(tmp_path):
         "test-resources/in/olist_order_items_dataset.csv",
         "output_path": "test-resources/out/products_sales",
         "order_status_filter": "delivered",
-        "output_engine": "fastparquet",
         "partition_cols": ["product_id"],
         "log_level": "INFO",
         "log_file_path": "pipeline.log",